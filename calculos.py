@@ -265,3 +265,18 @@ def convertir_a_excel(df_C, df_C_ajustada, df_R, df_actividades, fecha_inicio_pr
     return output.getvalue()
 
 
+
+def calcular_holguras(df_actividades, orden_topologico, matriz_adyacencia, tiempos_inicio):
+    """Calcula la holgura total de cada actividad (inicio más tardío menos inicio más temprano)."""
+    duraciones = pd.to_numeric(df_actividades['Duración'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    tiempos_inicio = np.asarray(tiempos_inicio, dtype=float)
+    fin_proyecto = np.max(tiempos_inicio + duraciones) if len(tiempos_inicio) else 0
+    inicio_tardio = fin_proyecto - duraciones
+
+    # Recorrido hacia atrás: una actividad debe terminar antes del inicio tardío de sus sucesoras
+    for idx in reversed(orden_topologico):
+        sucesores = np.where(matriz_adyacencia[idx, :] == 1)[0]
+        if len(sucesores) > 0:
+            inicio_tardio[idx] = np.min(inicio_tardio[sucesores]) - duraciones[idx]
+
+    return inicio_tardio - tiempos_inicio
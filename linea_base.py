@@ -0,0 +1,234 @@
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+# Versión del formato en disco: cabecera JSON + un archivo .npy por arreglo
+FORMATO_VERSION = 1
+ARCHIVO_CABECERA = "cabecera.json"
+ARREGLOS = (
+    "nombres", "duraciones", "unidades", "aristas",
+    "tiempos_inicio", "tiempos_inicio_ajustados", "holguras",
+    "matriz_C", "matriz_R", "matriz_C_ajustada"
+)
+# Arreglos con un valor (o una fila) por actividad
+ARREGLOS_POR_ACTIVIDAD = (
+    "duraciones", "unidades", "tiempos_inicio", "tiempos_inicio_ajustados", "holguras",
+    "matriz_C", "matriz_R", "matriz_C_ajustada"
+)
+
+def validar_nombres_unicos(nombres):
+    """Verifica que no haya actividades con el mismo nombre (la comparación empareja por nombre)."""
+    nombres = pd.Series(np.asarray(nombres))
+    duplicados = nombres[nombres.duplicated()].unique()
+    if len(duplicados) > 0:
+        raise ValueError(f"Hay actividades con nombre duplicado: {', '.join(map(str, duplicados))}")
+
+def validar_nombre_linea_base(nombre):
+    """Verifica que el nombre de la línea base sea un nombre de directorio simple."""
+    nombre = str(nombre).strip()
+    if not nombre:
+        raise ValueError("El nombre de la línea base no puede estar vacío.")
+    if nombre.startswith(".") or ".." in nombre or "/" in nombre or "\\" in nombre or (os.altsep and os.altsep in nombre):
+        raise ValueError(f"Nombre de línea base no válido: '{nombre}'")
+    return nombre
+
+def construir_linea_base(df_actividades, matriz_adyacencia, tiempos_inicio, tiempos_inicio_ajustados,
+                         holguras, matriz_C, matriz_R, matriz_C_ajustada, fecha_inicio_proyecto):
+    """Agrupa el cronograma calculado en un diccionario de arreglos listo para guardar o comparar."""
+    nombres = df_actividades['Nombre de Actividad'].astype(str).to_numpy(dtype=str)
+    validar_nombres_unicos(nombres)
+
+    return {
+        "fecha_inicio_proyecto": datetime.combine(fecha_inicio_proyecto, datetime.min.time()),
+        "nombres": nombres,
+        "duraciones": pd.to_numeric(df_actividades['Duración'], errors='coerce').fillna(0).to_numpy(dtype=np.float64),
+        "unidades": pd.to_numeric(df_actividades['Unidades a Producir'], errors='coerce').fillna(0).to_numpy(dtype=np.float64),
+        # El grafo se guarda como lista de aristas (predecesor, sucesor) en lugar de la matriz n x n
+        "aristas": np.argwhere(np.asarray(matriz_adyacencia) == 1).astype(np.int32).reshape(-1, 2),
+        "tiempos_inicio": np.asarray(tiempos_inicio, dtype=np.float64),
+        "tiempos_inicio_ajustados": np.asarray(tiempos_inicio_ajustados, dtype=np.float64),
+        # Holgura del cronograma contractual (calculada con T_i, no con T_i')
+        "holguras": np.asarray(holguras, dtype=np.float64),
+        "matriz_C": np.asarray(matriz_C, dtype=np.float64),
+        "matriz_R": np.asarray(matriz_R, dtype=np.float64),
+        "matriz_C_ajustada": np.asarray(matriz_C_ajustada, dtype=np.float64).reshape(len(nombres), -1),
+    }
+
+def guardar_linea_base(directorio, nombre, linea_base, sobrescribir=False):
+    """
+    Guarda una línea base en directorio/nombre (cabecera JSON + arreglos .npy sin comprimir).
+    - Se escribe primero en un directorio temporal y luego se mueve a su lugar, para no dejar
+      nunca una línea base a medio escribir.
+    - Si ya existe una línea base con ese nombre, solo se reemplaza con sobrescribir=True.
+    - Devuelve el nombre normalizado con el que se guardó.
+    """
+    nombre = validar_nombre_linea_base(nombre)
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, nombre)
+
+    if os.path.exists(ruta) and not sobrescribir:
+        raise FileExistsError(f"Ya existe una línea base con el nombre '{nombre}'.")
+
+    ruta_temporal = tempfile.mkdtemp(prefix=f".{nombre}.", dir=directorio)
+    ruta_anterior = None
+    try:
+        for arreglo in ARREGLOS:
+            np.save(os.path.join(ruta_temporal, f"{arreglo}.npy"), linea_base[arreglo], allow_pickle=False)
+
+        cabecera = {
+            "version": FORMATO_VERSION,
+            "fecha_inicio_proyecto": linea_base["fecha_inicio_proyecto"].strftime("%Y-%m-%d"),
+            "creada": datetime.now().isoformat(timespec="seconds"),
+            "num_actividades": int(len(linea_base["nombres"])),
+            "arreglos": list(ARREGLOS)
+        }
+        with open(os.path.join(ruta_temporal, ARCHIVO_CABECERA), "w", encoding="utf-8") as archivo:
+            json.dump(cabecera, archivo, ensure_ascii=False, indent=2)
+
+        # os.replace no reemplaza directorios con contenido: la línea base anterior se aparta primero
+        if os.path.exists(ruta):
+            ruta_anterior = tempfile.mkdtemp(prefix=f".{nombre}.anterior.", dir=directorio)
+            os.replace(ruta, os.path.join(ruta_anterior, nombre))
+        os.replace(ruta_temporal, ruta)
+        if ruta_anterior:
+            shutil.rmtree(ruta_anterior, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(ruta_temporal, ignore_errors=True)
+        # Si la línea base anterior ya se había apartado, se restaura en su lugar
+        if ruta_anterior:
+            if not os.path.exists(ruta) and os.path.exists(os.path.join(ruta_anterior, nombre)):
+                os.replace(os.path.join(ruta_anterior, nombre), ruta)
+            shutil.rmtree(ruta_anterior, ignore_errors=True)
+        raise
+
+    return nombre
+
+def cargar_linea_base(ruta):
+    """Carga una línea base mapeando los arreglos en memoria (solo lectura), sin copiarlos."""
+    ruta_cabecera = os.path.join(ruta, ARCHIVO_CABECERA)
+    if not os.path.exists(ruta_cabecera):
+        raise FileNotFoundError(f"No se encontró una línea base válida en: {ruta}")
+
+    with open(ruta_cabecera, encoding="utf-8") as archivo:
+        cabecera = json.load(archivo)
+
+    if cabecera.get("version") != FORMATO_VERSION:
+        raise ValueError(f"Versión de línea base no soportada: {cabecera.get('version')} (se esperaba {FORMATO_VERSION})")
+
+    # Solo se cargan los arreglos conocidos: la cabecera no decide qué archivos se abren
+    arreglos_cabecera = cabecera.get("arreglos")
+    if not isinstance(arreglos_cabecera, list) or not all(isinstance(n, str) for n in arreglos_cabecera) \
+            or set(arreglos_cabecera) != set(ARREGLOS):
+        raise ValueError(f"Línea base inconsistente: la cabecera debe listar exactamente los arreglos {', '.join(ARREGLOS)}")
+
+    linea_base = {
+        nombre: np.load(os.path.join(ruta, f"{nombre}.npy"), mmap_mode="r", allow_pickle=False)
+        for nombre in ARREGLOS
+    }
+
+    # **🔹 Validar que los arreglos sean consistentes con la cabecera**
+    num_actividades = cabecera.get("num_actividades")
+    if len(linea_base["nombres"]) != num_actividades:
+        raise ValueError(f"Línea base inconsistente: {len(linea_base['nombres'])} nombres, se esperaban {num_actividades}")
+    for nombre in ARREGLOS_POR_ACTIVIDAD:
+        if linea_base[nombre].shape[0] != num_actividades:
+            raise ValueError(f"Línea base inconsistente: '{nombre}' tiene {linea_base[nombre].shape[0]} filas, se esperaban {num_actividades}")
+    aristas = linea_base["aristas"]
+    if aristas.ndim != 2 or aristas.shape[1] != 2 or (aristas.size and (aristas.min() < 0 or aristas.max() >= num_actividades)):
+        raise ValueError("Línea base inconsistente: las aristas del grafo no corresponden a las actividades.")
+
+    linea_base["fecha_inicio_proyecto"] = datetime.strptime(cabecera["fecha_inicio_proyecto"], "%Y-%m-%d")
+    linea_base["creada"] = cabecera.get("creada")
+    return linea_base
+
+def listar_lineas_base(directorio):
+    """Lista los nombres de las líneas base guardadas en un directorio."""
+    if not os.path.isdir(directorio):
+        return []
+    return sorted(
+        nombre for nombre in os.listdir(directorio)
+        if not nombre.startswith(".") and os.path.exists(os.path.join(directorio, nombre, ARCHIVO_CABECERA))
+    )
+
+def calcular_inicio_fin_produccion(linea_base):
+    """
+    Obtiene el primer día y el día siguiente al último con producción en C' para cada actividad.
+    Las actividades sin producción usan T_i' y su duración nominal.
+    """
+    C_ajustada = np.asarray(linea_base["matriz_C_ajustada"])
+    inicio = np.asarray(linea_base["tiempos_inicio_ajustados"], dtype=float).copy()
+    fin = inicio + np.asarray(linea_base["duraciones"], dtype=float)
+
+    con_produccion = C_ajustada > 0
+    filas = con_produccion.any(axis=1)
+    if C_ajustada.shape[1] > 0:
+        inicio[filas] = np.argmax(con_produccion, axis=1)[filas]
+        fin[filas] = C_ajustada.shape[1] - np.argmax(con_produccion[:, ::-1], axis=1)[filas]
+
+    return inicio, fin
+
+def comparar_lineas_base(base, actual):
+    """
+    Compara dos líneas base (por ejemplo, la contractual contra el avance real).
+    - Devuelve las actividades desfasadas, emparejadas por nombre y en días calendario desde el inicio de la base.
+    - Devuelve la diferencia de producción diaria de C' alineada por fecha.
+    """
+    validar_nombres_unicos(base["nombres"])
+    validar_nombres_unicos(actual["nombres"])
+    desplazamiento = (actual["fecha_inicio_proyecto"] - base["fecha_inicio_proyecto"]).days
+
+    # **🔹 Actividades desfasadas (inicio y fin tomados de la producción real en C')**
+    def tabla_actividades(linea_base, desplazamiento_dias):
+        inicio, fin = calcular_inicio_fin_produccion(linea_base)
+        return pd.DataFrame({
+            'Nombre de Actividad': np.asarray(linea_base["nombres"]),
+            'Inicio': inicio + desplazamiento_dias,
+            'Fin': fin + desplazamiento_dias,
+            'Holgura Contractual': np.asarray(linea_base["holguras"])
+        })
+
+    df_desfases = tabla_actividades(base, 0).merge(
+        tabla_actividades(actual, desplazamiento), on='Nombre de Actividad',
+        how='outer', suffixes=(' Base', ' Actual'), indicator=True
+    )
+    df_desfases['Desfase Inicio'] = df_desfases['Inicio Actual'] - df_desfases['Inicio Base']
+    df_desfases['Desfase Fin'] = df_desfases['Fin Actual'] - df_desfases['Fin Base']
+    df_desfases['Estado'] = np.select(
+        [
+            df_desfases['_merge'] == 'left_only',
+            df_desfases['_merge'] == 'right_only',
+            (df_desfases['Desfase Inicio'] > 0) | (df_desfases['Desfase Fin'] > 0),
+            (df_desfases['Desfase Inicio'] < 0) | (df_desfases['Desfase Fin'] < 0)
+        ],
+        ["Eliminada", "Nueva", "Retrasada", "Adelantada"],
+        default="Sin cambios"
+    )
+    df_desfases = df_desfases.drop(columns='_merge')
+    df_desfases = df_desfases[df_desfases['Estado'] != "Sin cambios"].reset_index(drop=True)
+
+    # **🔹 Diferencia de producción por día**
+    produccion_base = np.asarray(base["matriz_C_ajustada"]).sum(axis=0)
+    produccion_actual = np.asarray(actual["matriz_C_ajustada"]).sum(axis=0)
+
+    inicio = min(0, desplazamiento)
+    fin = max(len(produccion_base), desplazamiento + len(produccion_actual))
+    serie_base = np.zeros(fin - inicio)
+    serie_actual = np.zeros(fin - inicio)
+    serie_base[-inicio:-inicio + len(produccion_base)] = produccion_base
+    serie_actual[desplazamiento - inicio:desplazamiento - inicio + len(produccion_actual)] = produccion_actual
+
+    dias = np.arange(inicio, fin)
+    df_produccion = pd.DataFrame({
+        'Día': dias,
+        'Fecha': [base["fecha_inicio_proyecto"] + timedelta(days=int(dia)) for dia in dias],
+        'Producción Base': serie_base,
+        'Producción Actual': serie_actual,
+        'Delta': serie_actual - serie_base
+    })
+    df_produccion['Delta Acumulado'] = df_produccion['Delta'].cumsum()
+
+    return df_desfases, df_produccion
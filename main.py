@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 from datetime import datetime
 import pandas as pd
@@ -10,13 +11,20 @@ from adyacencia import generar_matriz_adyacencia, calcular_orden_topologico
 from calculos import (
     calcular_tiempos_inicio, generar_matriz_contractual, convertir_a_excel, 
     generar_matriz_restricciones, generar_matriz_contractual_ajustada, 
-    calcular_tiempos_inicio_ajustados, generar_matriz_adyacencia_ajustada, calcular_ruta_critica_ajustada
+    calcular_tiempos_inicio_ajustados, generar_matriz_adyacencia_ajustada, calcular_ruta_critica_ajustada,
+    calcular_holguras
+)
+from linea_base import (
+    construir_linea_base, guardar_linea_base, cargar_linea_base, listar_lineas_base, comparar_lineas_base
 )
 from visualizacion import mostrar_matriz_latex, generar_grafo_ruta_critica, generar_gantt_plotly
 
 # Inicializar la base de datos
 inicializar_bd()
 
+# Directorio donde se guardan las líneas base del cronograma
+DIRECTORIO_LINEAS_BASE = "lineas_base"
+
 def cargar_restricciones_bd():
     """Carga las restricciones desde la base de datos y las convierte en DataFrame."""
     restricciones = obtener_restricciones()  # 🔹 Aquí realmente consultamos la BD
@@ -142,6 +150,36 @@ def main():
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
 
+            # 📌 LÍNEA BASE: guardar el cronograma calculado y compararlo contra el avance
+            try:
+                # Holgura del cronograma contractual (T_i)
+                holguras = calcular_holguras(df_actividades, orden_topologico, matriz_adyacencia, tiempos_inicio)
+                mostrar_matriz_latex("H", holguras)
+                linea_base_actual = construir_linea_base(
+                    df_actividades, matriz_adyacencia, tiempos_inicio, tiempos_inicio_ajustados,
+                    holguras, matriz_C, matriz_R, matriz_C_ajustada, fecha_inicio_proyecto
+                )
+
+                st.subheader("Línea Base del Cronograma")
+                nombre_linea_base = st.text_input("Nombre de la línea base:", value=fecha_inicio_proyecto.strftime("%Y-%m-%d"))
+                sobrescribir_linea_base = st.checkbox("Sobrescribir si ya existe una línea base con ese nombre")
+                if st.button("Guardar Línea Base"):
+                    nombre_guardado = guardar_linea_base(DIRECTORIO_LINEAS_BASE, nombre_linea_base, linea_base_actual, sobrescribir=sobrescribir_linea_base)
+                    st.success(f"Línea base '{nombre_guardado}' guardada correctamente.")
+
+                lineas_base = listar_lineas_base(DIRECTORIO_LINEAS_BASE)
+                if lineas_base:
+                    seleccion = st.selectbox("Comparar contra la línea base:", lineas_base)
+                    linea_base = cargar_linea_base(os.path.join(DIRECTORIO_LINEAS_BASE, seleccion))
+                    df_desfases, df_produccion = comparar_lineas_base(linea_base, linea_base_actual)
+                    st.write("Actividades desfasadas:")
+                    st.dataframe(df_desfases)
+                    st.write("Diferencia de producción por día:")
+                    st.line_chart(df_produccion.set_index('Fecha')[['Producción Base', 'Producción Actual']])
+                    st.dataframe(df_produccion)
+            except (ValueError, KeyError, OSError) as e:
+                st.error(f"Error en la línea base: {str(e)}")
+
             # Visualizaciones
             generar_grafo_ruta_critica(G, duraciones=df_actividades['Duración'].tolist())
             generar_gantt_plotly(df_actividades, orden_topologico, tiempos_inicio, ruta_critica, matriz_adyacencia, fecha_inicio_proyecto)